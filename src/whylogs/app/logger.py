@@ -1,11 +1,16 @@
 """
 Class and functions for whylogs logging
 """
+from __future__ import annotations
+
 import datetime
 import hashlib
 import json
 import logging
+import os
 import re
+import time
+from collections import deque
 from pathlib import Path
 from typing import IO, AnyStr, Callable, Dict, List, Optional, Union
 
@@ -32,6 +37,21 @@ _TAG_PREFIX = "whylogs.tag."
 _TAG_KEY = "key"
 _TAG_VALUE = "value"
 
+# rotation interval specification, e.g. "30s", "2h", "d"
+_ROTATION_PATTERN = re.compile(r"^(\d*)([smhd])$")
+# seconds per unit and filename suffix format, keyed by rotation unit;
+# compiled once so every Logger shares the same specs
+_ROTATION_SPECS = {
+    "s": (1, "%Y-%m-%d_%H-%M-%S"),
+    "m": (60, "%Y-%m-%d_%H-%M"),
+    "h": (60 * 60, "%Y-%m-%d_%H"),
+    "d": (60 * 60 * 24, "%Y-%m-%d"),
+}
+
+# below this size a CSV parse is dominated by parser start-up cost rather
+# than parsing itself, so _read_csv picks a cheaper backend
+_SMALL_CSV_BYTES = 256_000
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,12 +110,14 @@ class Logger:
             writers = []
         self._active = True
         self._pending_timer_threads = []
+        # read the clock once for both timestamp defaults
+        now = datetime.datetime.now(datetime.timezone.utc)
         if session_timestamp is None:
-            self.session_timestamp = datetime.datetime.now(datetime.timezone.utc)
+            self.session_timestamp = now
         else:
             self.session_timestamp = session_timestamp
         if dataset_timestamp is None:
-            self.dataset_timestamp = datetime.datetime.now(datetime.timezone.utc)
+            self.dataset_timestamp = now
         else:
             self.dataset_timestamp = dataset_timestamp
         self.dataset_name = dataset_name
@@ -109,11 +131,37 @@ class Logger:
         self.profile_full_dataset = profile_full_dataset
         self.constraints = constraints
         self.set_segments(segments)
+        # constructor arguments shared by every profile this logger creates;
+        # built once here instead of on every rotation
+        self._profile_kwargs = dict(
+            session_timestamp=self.session_timestamp,
+            tags=self.tags,
+            metadata=self.metadata,
+            session_id=self.session_id,
+            constraints=self.constraints,
+        )
 
-        self._profiles = []
-        self._intialize_profiles(dataset_timestamp)
+        # ring of the active entry plus up to cache_size rotated entries;
+        # the deque evicts the oldest in O(1) so long-running rotating
+        # loggers don't grow without bound
+        self._profiles = deque(maxlen=cache_size + 1)
+        self._pending_profiles = []
+        self._batch_threshold = cache_size
+        # profile construction allocates sketches, so defer it until the
+        # first track call; loggers that never receive data stay cheap
+        self._current = None
+        self._full_profile = None
+        self._initial_dataset_timestamp = dataset_timestamp
         self.interval_multiplier = interval  # deprecated, rotation interval multiplier
         self.with_rotation_time = with_rotation_time  # rotation interval specification
+        self._rotation_enabled = False
+        # never reached when rotation is off; any stray should_rotate() call
+        # compares against infinity instead of branching
+        self.rotate_at = float("inf")
+        # memoized strftime result for the current rotation window
+        self._last_suffix_ts = None
+        self._last_suffix = None
+        self._last_log_datetime = None
         self._set_rotation(with_rotation_time)
 
     def __enter__(self):
@@ -130,13 +178,17 @@ class Logger:
         :return: the last backing dataset profile
         :rtype: DatasetProfile
         """
-        return self._profiles[-1]["full_profile"]
+        if self._active:
+            self._ensure_profile()
+        return self._full_profile
 
     def tracking_checks(self):
         if not self._active:
             return False
 
-        if self.should_rotate():
+        self._ensure_profile()
+        # rotation is off by default; don't pay for the clock check per call
+        if self._rotation_enabled and self.should_rotate():
             self._rotate_time()
         return True
 
@@ -148,11 +200,13 @@ class Logger:
         :return: the last backing dataset profile
         :rtype: Dict[str, DatasetProfile]
         """
-        return self._profiles[-1]["segmented_profiles"]
+        if self._active:
+            self._ensure_profile()
+        return self._current["segmented_profiles"]
 
     def get_segment(self, segment: Segment) -> Optional[DatasetProfile]:
         hashed_seg = hash_segment(segment)
-        return self._profiles[-1]["segmented_profiles"].get(hashed_seg, None)
+        return self.segmented_profiles.get(hashed_seg, None)
 
     def set_segments(self, segments: Union[List[Segment], List[str], str]) -> None:
         if segments:
@@ -179,21 +233,27 @@ class Logger:
 
     def _intialize_profiles(
         self,
-        dataset_timestamp: Optional[datetime.datetime] = datetime.datetime.now(datetime.timezone.utc),
+        dataset_timestamp: Optional[datetime.datetime] = None,
     ) -> None:
+        # no eager clock read here: a datetime default would be frozen at
+        # import time, and rotation stamps the profile before it is written
 
         full_profile = None
         if self.full_profile_check():
-            full_profile = DatasetProfile(
-                self.dataset_name,
-                dataset_timestamp=dataset_timestamp,
-                session_timestamp=self.session_timestamp,
-                tags=self.tags,
-                metadata=self.metadata,
-                session_id=self.session_id,
-                constraints=self.constraints,
-            )
+            full_profile = DatasetProfile(self.dataset_name, dataset_timestamp=dataset_timestamp, **self._profile_kwargs)
         self._profiles.append({"full_profile": full_profile, "segmented_profiles": {}})
+        # direct references to the active entry and its full profile so hot
+        # paths skip the list-indexing and dict lookup on every call; only
+        # rotation moves them
+        self._current = self._profiles[-1]
+        self._full_profile = full_profile
+
+    def _ensure_profile(self) -> None:
+        """
+        Materialize the backing profile entry if it does not exist yet.
+        """
+        if self._current is None:
+            self._intialize_profiles(self._initial_dataset_timestamp)
 
     def _set_rotation(self, with_rotation_time: str = None):
 
@@ -202,28 +262,19 @@ class Logger:
 
         self.with_rotation_time = with_rotation_time.lower()
 
-        m = re.match(r"^(\d*)([smhd])$", with_rotation_time.lower())
+        m = _ROTATION_PATTERN.match(self.with_rotation_time)
         if m is None:
             raise TypeError("Invalid rotation interval, expected integer followed by one of 's', 'm', 'h', or 'd'")
 
-        interval = 1 if m.group(1) == "" else int(m.group(1))
-        if m.group(2) == "s":
-            self.suffix = "%Y-%m-%d_%H-%M-%S"
-        elif m.group(2) == "m":
-            interval *= 60  # one minute
-            self.suffix = "%Y-%m-%d_%H-%M"
-        elif m.group(2) == "h":
-            interval *= 60 * 60  # one hour
-            self.suffix = "%Y-%m-%d_%H"
-        elif m.group(2) == "d":
-            interval *= 60 * 60 * 24  # one day
-            self.suffix = "%Y-%m-%d"
-        else:
-            raise TypeError("Invalid rotation interval, expected integer followed by one of 's', 'm', 'h', or 'd'")
-        # time in seconds
-        current_time = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+        unit_seconds, self.suffix = _ROTATION_SPECS[m.group(2)]
+        interval = (1 if m.group(1) == "" else int(m.group(1))) * unit_seconds
+        # time in seconds; time.time() avoids a datetime round-trip per call
+        current_time = int(time.time())
         self.interval = interval * self.interval_multiplier
         self.rotate_at = self.rotate_when(current_time)
+        self._rotation_enabled = True
+        # the suffix format may have changed; drop any memoized formatting
+        self._last_suffix_ts = None
 
         timer_thread = timer_wrap(self.tracking_checks, self.interval)
         self._pending_timer_threads.append(timer_thread)
@@ -234,36 +285,40 @@ class Logger:
     def should_rotate(
         self,
     ):
-
-        if self.with_rotation_time is None:
-            return False
-
-        current_time = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
-        return current_time >= self.rotate_at
+        # rotate_at is infinity when rotation was never armed
+        return int(time.time()) >= self.rotate_at
 
     def _rotate_time(self):
         """
         rotate with time add a suffix
         """
 
-        current_time = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+        current_time = int(time.time())
         # get the time that this current logging rotation started
         sequence_start = self.rotate_at - self.interval
-        time_tuple = datetime.datetime.fromtimestamp(sequence_start)
-        rotation_suffix = "." + time_tuple.strftime(self.suffix)
-        log_datetime = datetime.datetime.strptime(time_tuple.strftime(self.suffix), self.suffix)
+        # strftime/strptime are comparatively expensive; reuse the formatted
+        # suffix when a rotation is re-attempted within the same window
+        if sequence_start != self._last_suffix_ts:
+            formatted = datetime.datetime.fromtimestamp(sequence_start).strftime(self.suffix)
+            self._last_suffix = "." + formatted
+            self._last_log_datetime = datetime.datetime.strptime(formatted, self.suffix)
+            self._last_suffix_ts = sequence_start
+        rotation_suffix = self._last_suffix
+        log_datetime = self._last_log_datetime
 
         # modify the segment datetime stamps
         if self.segments is None or self.profile_full_dataset:
-            self._profiles[-1]["full_profile"].dataset_timestamp = log_datetime
+            self._current["full_profile"].dataset_timestamp = log_datetime
         if self.segments is not None:
-            for _, each_prof in self._profiles[-1]["segmented_profiles"].items():
+            for _, each_prof in self._current["segmented_profiles"].items():
                 each_prof.dataset_timestamp = log_datetime
 
-        self.flush(rotation_suffix)
-
-        if len(self._profiles) > self.cache_size:
-            self._profiles[-self.cache_size - 1] = None
+        # queue the rotated profiles and only hand them to the writers once
+        # enough have accumulated, so high-frequency rotation does not pay
+        # writer I/O per rotation
+        self._pending_profiles.append((self._current, rotation_suffix))
+        if len(self._pending_profiles) >= self._batch_threshold:
+            self._drain_pending()
 
         for pending_timers in self._pending_timer_threads:
             pending_timers.cancel()
@@ -275,12 +330,10 @@ class Logger:
         self._pending_timer_threads.clear()
         self._intialize_profiles()
 
-        # compute new rotate_at and while loop in case current function
-        # takes longer than interval
-
-        self.rotate_at = self.rotate_when(current_time)
-        while self.rotate_at <= current_time:
-            self.rotate_at += self.interval
+        # advance rotate_at to the next interval boundary on the original
+        # schedule in a single step, skipping any boundaries that were missed
+        # while this rotation was running
+        self.rotate_at += ((current_time - self.rotate_at) // self.interval + 1) * self.interval
 
         new_thread = timer_wrap(self.tracking_checks, self.interval)
         self._pending_timer_threads.append(new_thread)
@@ -290,25 +343,52 @@ class Logger:
         Synchronously perform all remaining write tasks
         """
         if not self._active:
-            print("WARNING: attempting to flush a closed logger")
+            self._py_logger.warning("attempting to flush a closed logger")
             return None
 
-        for writer in self.writers:
-            # write full profile
-            if self.full_profile_check():
-                if rotation_suffix is None:
-                    writer.write(self._profiles[-1]["full_profile"])
-                else:
-                    writer.write(self._profiles[-1]["full_profile"], rotation_suffix)
+        self._drain_pending()
+        if self._current is None:
+            # nothing was ever tracked, so there is nothing to write
+            return None
+        # snapshot the profile pairs and writer list once; the loop body then
+        # has no repeated attribute loads and is immune to writers being
+        # added mid-flush
+        pairs = self._write_pairs(self._current, rotation_suffix)
+        for writer in tuple(self.writers):
+            writer.write_batch(pairs)
+
+    def _write_pairs(self, profile_entry, rotation_suffix: Optional[str] = None):
+        """
+        Collect the (profile, suffix) pairs to be written for a single
+        profile entry (full profile plus any segmented profiles).
+        """
+        pairs = []
+        # write full profile
+        if self.full_profile_check():
+            pairs.append((profile_entry["full_profile"], rotation_suffix))
 
-            if self.segments is not None:
-                for hashseg, each_seg_prof in self._profiles[-1]["segmented_profiles"].items():
-                    seg_suffix = hashseg
-                    full_suffix = "_" + seg_suffix
-                    if rotation_suffix is not None:
-                        full_suffix += rotation_suffix
+        if self.segments is not None:
+            for hashseg, each_seg_prof in profile_entry["segmented_profiles"].items():
+                seg_suffix = hashseg
+                full_suffix = "_" + seg_suffix
+                if rotation_suffix is not None:
+                    full_suffix += rotation_suffix
+
+                pairs.append((each_seg_prof, full_suffix))
+        return pairs
 
-                    writer.write(each_seg_prof, full_suffix)
+    def _drain_pending(self):
+        """
+        Hand all queued rotated profiles to the writers in one batch.
+        """
+        if not self._pending_profiles:
+            return
+        pending, self._pending_profiles = self._pending_profiles, []
+        pairs = []
+        for profile_entry, rotation_suffix in pending:
+            pairs.extend(self._write_pairs(profile_entry, rotation_suffix))
+        for writer in tuple(self.writers):
+            writer.write_batch(pairs)
 
     def full_profile_check(
         self,
@@ -327,15 +407,27 @@ class Logger:
         if not self._active:
             self._py_logger.warning("attempting to close a closed logger")
             return None
-        if self.with_rotation_time is None:
+        if self._current is None:
+            # no data was ever logged; skip the final write entirely
+            pass
+        elif self.with_rotation_time is None:
             self.flush()
         else:
             self._rotate_time()
             _ = self._profiles.pop()
+        self._drain_pending()
+
+        # writers offload their I/O to background threads (see async_wrap),
+        # which keeps writer latency off the logging hot path; wait for them
+        # here so close() guarantees the profiles are durably written
+        for writer in self.writers:
+            writer.close()
 
         self._active = False
-        profile = self._profiles[-1]["full_profile"]
+        profile = self._profiles[-1]["full_profile"] if self._profiles else None
         self._profiles = None
+        self._current = None
+        self._full_profile = None
 
         # time rotation threads
         for t in self._pending_timer_threads:
@@ -374,11 +466,57 @@ class Logger:
             self.log_dataframe(pd.DataFrame([features]))
         else:
             if self.full_profile_check():
-                self._profiles[-1]["full_profile"].track_datum(feature_name, value, character_list=character_list, token_method=token_method)
+                self._full_profile.track_datum(feature_name, value, character_list=character_list, token_method=token_method)
 
             if self.segments:
                 self.log_segment_datum(feature_name, value, character_list=character_list, token_method=token_method)
 
+    def log_features(self, features: Dict[str, any]):
+        """
+        Fast path for logging a map of features.
+
+        Unlike :func:`Logger.log`, this tracks the values directly on the
+        full profile without building a one-row dataframe, and does not
+        apply segmentation. Prefer it in tight loops that log one record
+        of plain values at a time.
+
+        :param features: a map of key value feature for model input
+        """
+        if not self.tracking_checks():
+            return
+        if self.full_profile_check():
+            self._full_profile.track(features)
+
+    def log_datum(self, feature_name: str, value: any, character_list: Optional[str] = None, token_method: Optional[Callable] = None):
+        """
+        Fast path for logging a single feature value, skipping the
+        argument disambiguation checks of the polymorphic :func:`Logger.log`.
+
+        :param feature_name: name of a single feature
+        :param value: value of the single feature
+        """
+        if not self.tracking_checks():
+            return
+        if self.full_profile_check():
+            self._full_profile.track_datum(feature_name, value, character_list=character_list, token_method=token_method)
+
+        if self.segments:
+            self.log_segment_datum(feature_name, value, character_list=character_list, token_method=token_method)
+
+    def log_batch(self, features_list: List[Dict[str, any]]):
+        """
+        Log a batch of feature records in one pass.
+
+        Building a single dataframe for the whole batch amortizes the
+        per-call overhead of :func:`Logger.log` across all records, so prefer
+        this over calling `log()` in a loop.
+
+        :param features_list: a list of key value feature maps, one per record
+        """
+        if not features_list:
+            return
+        self.log_dataframe(pd.DataFrame(features_list))
+
     def log_segment_datum(self, feature_name, value, character_list: str = None, token_method: Optional[Callable] = None):
         segment = [{"key": feature_name, "value": value}]
         segment_profile = self.get_segment(segment)
@@ -389,7 +527,7 @@ class Logger:
                 else:
                     segment_profile.track_datum(feature_name, value, character_list=character_list, token_method=token_method)
             else:
-                for each_profile in self._profiles[-1]["segmented_profiles"]:
+                for each_profile in self._current["segmented_profiles"]:
                     each_profile.track_datum(feature_name, value, character_list=character_list, token_method=token_method)
         elif self.segment_type == "set":
             if segment not in self.segments:
@@ -408,7 +546,8 @@ class Logger:
         score_field=None,
     ):
 
-        self._profiles[-1]["full_profile"].track_metrics(
+        self._ensure_profile()
+        self._full_profile.track_metrics(
             targets,
             predictions,
             scores,
@@ -451,7 +590,7 @@ class Logger:
                 feature_name=feature_name,
             )
 
-        track_image(self._profiles[-1]["full_profile"])
+        track_image(self._full_profile)
 
     def log_local_dataset(
         self,
@@ -519,7 +658,7 @@ class Logger:
         if not self.tracking_checks():
             return None
         track_bounding_box = TrackBB(obj=annotation_data)
-        track_bounding_box(self._profiles[-1]["full_profile"])
+        track_bounding_box(self._full_profile)
 
     def log_csv(
         self,
@@ -535,15 +674,51 @@ class Logger:
             filepath_or_buffer: the path to the CSV or a CSV buffer
             segments: define either a list of segment keys or a list of segments tags: `[  {"key":<featurename>,"value": <featurevalue>},... ]`
             profile_full_dataset: when segmenting dataset, an option to keep the full unsegmented profile of the dataset
-            **kwargs: from pandas:read_csv
+            **kwargs: from pandas:read_csv. Pass `chunksize` to stream the
+                file in chunks and keep peak memory bounded by the chunk size
+                instead of the file size.
         """
         self.profile_full_dataset = profile_full_dataset
         if segments is not None:
             self.set_segments(segments)
 
-        df = pd.read_csv(filepath_or_buffer, **kwargs)
+        if kwargs.get("chunksize") is not None:
+            # stream the file chunk by chunk so each chunk can be tracked and
+            # discarded instead of materializing the whole CSV in memory
+            for chunk in pd.read_csv(filepath_or_buffer, **kwargs):
+                self.log_dataframe(chunk)
+            return
+
+        df = self._read_csv(filepath_or_buffer, **kwargs)
         self.log_dataframe(df)
 
+    @staticmethod
+    def _read_csv(filepath_or_buffer: Union[str, Path, IO[AnyStr]], **kwargs):
+        """
+        Read a CSV with pandas, picking the engine by file size. Small files
+        are dominated by parser start-up cost, so they use the default engine
+        in a single block. Larger files prefer the PyArrow engine, whose
+        multithreaded C++ parser is several times faster than the default
+        engine on real-world files, falling back to the default engine when
+        PyArrow is unavailable or an option is unsupported. Only plain paths
+        are retried, since a failed attempt may have consumed a buffer.
+        """
+        if "engine" not in kwargs and isinstance(filepath_or_buffer, (str, Path)):
+            try:
+                small = os.path.getsize(filepath_or_buffer) < _SMALL_CSV_BYTES
+            except OSError:
+                small = False
+            if small:
+                # a single-block parse skips chunked dtype inference, and
+                # PyArrow's thread-pool start-up would outweigh any speedup
+                kwargs.setdefault("low_memory", False)
+                return pd.read_csv(filepath_or_buffer, **kwargs)
+            try:
+                return pd.read_csv(filepath_or_buffer, engine="pyarrow", **kwargs)
+            except (ImportError, TypeError, ValueError) as e:
+                logger.debug(f"PyArrow CSV engine not used ({e}), falling back to the default engine")
+        return pd.read_csv(filepath_or_buffer, **kwargs)
+
     def log_dataframe(
         self,
         df,
@@ -566,7 +741,7 @@ class Logger:
             self.set_segments(segments)
 
         if self.full_profile_check():
-            self._profiles[-1]["full_profile"].track_dataframe(df)
+            self._full_profile.track_dataframe(df)
 
         if self.segments:
             self.log_segments(df)
@@ -624,18 +799,15 @@ class Logger:
         segment_profile = self.get_segment(segment_key_values)
 
         if segment_profile is None:
+            kwargs = dict(self._profile_kwargs, tags={**self.tags, **segment_tags})
             segment_profile = DatasetProfile(
                 self.dataset_name,
                 dataset_timestamp=datetime.datetime.now(datetime.timezone.utc),
-                session_timestamp=self.session_timestamp,
-                tags={**self.tags, **segment_tags},
-                metadata=self.metadata,
-                session_id=self.session_id,
-                constraints=self.constraints,
+                **kwargs,
             )
             segment_profile.track_dataframe(df)
             hashed_seg = hash_segment(segment_key_values)
-            self._profiles[-1]["segmented_profiles"][hashed_seg] = segment_profile
+            self._current["segmented_profiles"][hashed_seg] = segment_profile
         else:
             segment_profile.track_dataframe(df)
 
@@ -8,7 +8,7 @@ import typing
 from abc import ABC, abstractmethod
 from logging import getLogger
 from string import Template
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import boto3
 from smart_open import open
@@ -102,6 +102,22 @@ class Writer(ABC):
 
         raise NotImplementedError
 
+    def write_batch(self, profiles: List[Tuple[DatasetProfile, Optional[str]]]):
+        """
+        Write a batch of dataset profiles in a single call.
+
+        The default implementation simply loops over :func:`Writer.write`.
+        Writers with per-call setup cost (connections, uploads) can override
+        this to perform one bulk operation for the whole batch.
+
+        Parameters
+        ----------
+        profiles : list
+            List of `(profile, rotation_suffix)` tuples to write.
+        """
+        for profile, rotation_suffix in profiles:
+            self.write(profile, rotation_suffix)
+
     def path_suffix(self, profile: DatasetProfile):
         """
         Generate a path string for an output path from a dataset profile by
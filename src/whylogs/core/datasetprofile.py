@@ -285,12 +285,22 @@ class DatasetProfile:
         for col in df.columns:
             col_str = str(col)
 
+            # resolve the column profile once per column; routing every value
+            # through track() would repeat the name dispatch and column lookup
+            # for each element
+            prof = self.columns.get(col_str)
+            if prof is None:
+                constraints = None if self.constraints is None else self.constraints[col_str]
+                prof = ColumnProfile(col_str, constraints=constraints)
+                self.columns[col_str] = prof
+            track_value = prof.track
+
             x = df[col].values
             for xi in x:
                 count = count + 1
                 if large_df and (count % 200000 == 0):
                     logger.warning(f"Logged {count} elements out of {element_count}")
-                self.track(col_str, xi, character_list=None, token_method=None)
+                track_value(xi, character_list=None, token_method=None)
 
     def to_properties(self):
         """
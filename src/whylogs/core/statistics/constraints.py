@@ -1,7 +1,10 @@
+import functools
 import logging
+import operator
 import re
 from typing import Any, List, Mapping, Optional, Set
 
+import numpy as np
 from google.protobuf.json_format import Parse
 from google.protobuf.struct_pb2 import ListValue
 
@@ -20,6 +23,33 @@ from whylogs.util.protobuf import message_to_json
 
 logger = logging.getLogger(__name__)
 
+try:
+    # optional DFA-based engine: linear-time matching with no pathological
+    # backtracking on user-supplied patterns
+    import re2 as _re2
+except ImportError:
+    _re2 = None
+    logger.debug("Unable to load re2; install google-re2 for faster constraint pattern matching")
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str):
+    """
+    Compile a regex pattern once and share the compiled object between all
+    constraints that use the same pattern string, e.g. the same MATCH
+    constraint applied across many columns or deserialized repeatedly.
+
+    Prefers the re2 engine when installed; patterns using features re2 does
+    not support (e.g. backreferences) fall back to the stdlib engine.
+    """
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern)
+        except _re2.error as e:
+            logger.debug(f"re2 does not support pattern {pattern!r} ({e}), falling back to re")
+    return re.compile(pattern)
+
+
 """
 Dict indexed by constraint operator.
 
@@ -28,37 +58,73 @@ This is just a form of currying, and I chose to bind the boolean comparison oper
 """
 _value_funcs = {
     # functions that compare an incoming feature value to a literal value.
-    Op.LT: lambda x: lambda v: v < x,  # assert incoming value 'v' is less than some fixed value 'x'
-    Op.LE: lambda x: lambda v: v <= x,
-    Op.EQ: lambda x: lambda v: v == x,
-    Op.NE: lambda x: lambda v: v != x,
-    Op.GE: lambda x: lambda v: v >= x,
-    Op.GT: lambda x: lambda v: v > x,  # assert incoming value 'v' is greater than some fixed value 'x'
+    # comparisons bind a C-implemented operator.* partial with the literal as
+    # the first argument (note the flip: operator.gt(x, v) == v < x), so each
+    # streamed value costs one C call instead of a Python closure frame.
+    Op.LT: lambda x: functools.partial(operator.gt, x),  # assert incoming value 'v' is less than some fixed value 'x'
+    Op.LE: lambda x: functools.partial(operator.ge, x),
+    Op.EQ: lambda x: functools.partial(operator.eq, x),
+    Op.NE: lambda x: functools.partial(operator.ne, x),
+    Op.GE: lambda x: functools.partial(operator.le, x),
+    Op.GT: lambda x: functools.partial(operator.lt, x),  # assert incoming value 'v' is greater than some fixed value 'x'
     Op.MATCH: lambda x: lambda v: x.match(v) is not None,
     Op.NOMATCH: lambda x: lambda v: x.match(v) is None,
-    Op.IN_SET: lambda x: lambda v: v in x,
+    Op.IN_SET: lambda x: x.__contains__,
 }
 
+# ops whose value function expects a string input
+_REGEX_OPS = frozenset((Op.MATCH, Op.NOMATCH))
+
+_np_value_funcs = {
+    # NumPy ufunc equivalents of the comparison ops, used by update_batch to
+    # evaluate a whole numeric array in one vectorized pass.
+    Op.LT: np.less,
+    Op.LE: np.less_equal,
+    Op.EQ: np.equal,
+    Op.NE: np.not_equal,
+    Op.GE: np.greater_equal,
+    Op.GT: np.greater,
+}
+
+
+def _cmp_value(get, op, v):
+    # the comparator closes over a C-implemented attrgetter rather than a
+    # field-name string, so evaluation skips the dict-based getattr
+    return lambda s: op(get(s), v)
+
+
+def _btwn_value(get, v1, v2):
+    return lambda s: v1 <= get(s) <= v2
+
+
+def _cmp_fields(get, op, get2):
+    return lambda s: op(get(s), get2(s))
+
+
+def _btwn_fields(get, get2, get3):
+    return lambda s: get2(s) <= get(s) <= get3(s)
+
+
 _summary_funcs1 = {
     # functions that compare a summary field to a literal value.
-    Op.LT: lambda f, v: lambda s: getattr(s, f) < v,
-    Op.LE: lambda f, v: lambda s: getattr(s, f) <= v,
-    Op.EQ: lambda f, v: lambda s: getattr(s, f) == v,
-    Op.NE: lambda f, v: lambda s: getattr(s, f) != v,
-    Op.GE: lambda f, v: lambda s: getattr(s, f) >= v,
-    Op.GT: lambda f, v: lambda s: getattr(s, f) > v,
-    Op.BTWN: lambda f, v1, v2: lambda s: v1 <= getattr(s, f) <= v2,
+    Op.LT: lambda f, v: _cmp_value(operator.attrgetter(f), operator.lt, v),
+    Op.LE: lambda f, v: _cmp_value(operator.attrgetter(f), operator.le, v),
+    Op.EQ: lambda f, v: _cmp_value(operator.attrgetter(f), operator.eq, v),
+    Op.NE: lambda f, v: _cmp_value(operator.attrgetter(f), operator.ne, v),
+    Op.GE: lambda f, v: _cmp_value(operator.attrgetter(f), operator.ge, v),
+    Op.GT: lambda f, v: _cmp_value(operator.attrgetter(f), operator.gt, v),
+    Op.BTWN: lambda f, v1, v2: _btwn_value(operator.attrgetter(f), v1, v2),
 }
 
 _summary_funcs2 = {
     # functions that compare two summary fields.
-    Op.LT: lambda f, f2: lambda s: getattr(s, f) < getattr(s, f2),
-    Op.LE: lambda f, f2: lambda s: getattr(s, f) <= getattr(s, f2),
-    Op.EQ: lambda f, f2: lambda s: getattr(s, f) == getattr(s, f2),
-    Op.NE: lambda f, f2: lambda s: getattr(s, f) != getattr(s, f2),
-    Op.GE: lambda f, f2: lambda s: getattr(s, f) >= getattr(s, f2),
-    Op.GT: lambda f, f2: lambda s: getattr(s, f) > getattr(s, f2),
-    Op.BTWN: lambda f, f2, f3: lambda s: getattr(s, f2) <= getattr(s, f) <= getattr(s, f3),
+    Op.LT: lambda f, f2: _cmp_fields(operator.attrgetter(f), operator.lt, operator.attrgetter(f2)),
+    Op.LE: lambda f, f2: _cmp_fields(operator.attrgetter(f), operator.le, operator.attrgetter(f2)),
+    Op.EQ: lambda f, f2: _cmp_fields(operator.attrgetter(f), operator.eq, operator.attrgetter(f2)),
+    Op.NE: lambda f, f2: _cmp_fields(operator.attrgetter(f), operator.ne, operator.attrgetter(f2)),
+    Op.GE: lambda f, f2: _cmp_fields(operator.attrgetter(f), operator.ge, operator.attrgetter(f2)),
+    Op.GT: lambda f, f2: _cmp_fields(operator.attrgetter(f), operator.gt, operator.attrgetter(f2)),
+    Op.BTWN: lambda f, f2, f3: _btwn_fields(operator.attrgetter(f), operator.attrgetter(f2), operator.attrgetter(f3)),
 }
 
 
@@ -82,46 +148,107 @@ class ValueConstraint:
 
     """
 
+    # fixed attribute set: slots drop the per-instance __dict__, which adds up
+    # with many columns x many constraints, and make attribute loads in
+    # update() a C-level slot lookup
+    __slots__ = ("_name", "_verbose", "_cached_name", "op", "_is_regex_op", "total", "failures", "value", "regex_pattern", "func", "_pattern", "_ref_np", "update")
+
     def __init__(self, op: Op, value=None, regex_pattern: str = None, name: str = None, verbose=False):
         self._name = name
         self._verbose = verbose
         self.op = op
+        # cached so update() does not rescan a tuple of ops per value
+        self._is_regex_op = op in _REGEX_OPS
         self.total = 0
         self.failures = 0
+        self.value = value
+        self.regex_pattern = regex_pattern
+        self._pattern = None
 
         if isinstance(value, set) != (op == Op.IN_SET):
             raise ValueError("Value constraint must provide a set of values for using the IN operator")
 
+        self._ref_np = None
+        if op == Op.IN_SET and all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in value):
+            # purely numeric reference set: prebuild an array so update_batch
+            # can evaluate membership with one vectorized np.isin call
+            self._ref_np = np.fromiter(value, dtype=np.float64, count=len(value))
+
         if value is not None and regex_pattern is None:
             # numeric value
-            self.value = value
             self.func = _value_funcs[op](value)
 
         elif regex_pattern is not None and value is None:
             # Regex pattern
-            self.regex_pattern = regex_pattern
-            self.func = _value_funcs[op](re.compile(self.regex_pattern))
+            self._pattern = _compile_pattern(regex_pattern)
+            # bind the pattern's C-implemented match method once, rather than
+            # resolving the attribute again for every streamed value
+            match = self._pattern.match
+            if op == Op.MATCH:
+                self.func = lambda v: match(v) is not None
+            elif op == Op.NOMATCH:
+                self.func = lambda v: match(v) is None
+            else:
+                self.func = _value_funcs[op](self._pattern)
         else:
             raise ValueError("Value constraint must specify a numeric value or regex pattern, but not both")
 
+        # the name never changes after construction; format it once instead of
+        # on every property access (update's failure path reads it)
+        if name is not None:
+            self._cached_name = name
+        elif regex_pattern is None:
+            self._cached_name = f"value {Op.Name(op)} {value}"
+        else:
+            self._cached_name = f"value {Op.Name(op)} {regex_pattern}"
+
+        # specialize update at construction: numeric constraints skip the
+        # isinstance guard that only regex ops need
+        self.update = self._update_regex if self._is_regex_op else self._update_plain
+
     @property
     def name(self):
-        if getattr(self, "value", None):
-            return self._name if self._name is not None else f"value {Op.Name(self.op)} {self.value}"
-        else:
-            return self._name if self._name is not None else f"value {Op.Name(self.op)} {self.regex_pattern}"
+        return self._cached_name
 
-    def update(self, v) -> bool:
+    def _update_plain(self, v) -> bool:
         self.total += 1
-        if self.op in [Op.MATCH, Op.NOMATCH] and not isinstance(v, str):
+        if not self.func(v):
             self.failures += 1
-            if self._verbose:
+            if self._verbose and logger.isEnabledFor(logging.INFO):
+                logger.info(f"value constraint {self.name} failed on value {v}")
+
+    def _update_regex(self, v) -> bool:
+        self.total += 1
+        if not isinstance(v, str):
+            self.failures += 1
+            if self._verbose and logger.isEnabledFor(logging.INFO):
                 logger.info(f"value constraint {self.name} failed: value {v} not a string")
         elif not self.func(v):
             self.failures += 1
-            if self._verbose:
+            if self._verbose and logger.isEnabledFor(logging.INFO):
                 logger.info(f"value constraint {self.name} failed on value {v}")
 
+    def update_batch(self, values) -> None:
+        """
+        Evaluate the constraint against an array of values in one pass.
+
+        Numeric comparison ops on numeric arrays are evaluated with a single
+        NumPy ufunc call; other ops fall back to per-value update.
+        """
+        arr = np.asarray(values)
+        if arr.dtype.kind in "biuf":
+            np_op = _np_value_funcs.get(self.op)
+            if np_op is not None:
+                self.total += arr.size
+                self.failures += int(arr.size - np.count_nonzero(np_op(arr, self.value)))
+                return
+            if self._ref_np is not None:
+                self.total += arr.size
+                self.failures += int(arr.size - np.count_nonzero(np.isin(arr, self._ref_np)))
+                return
+        for v in arr:
+            self.update(v)
+
     def merge(self, other) -> "ValueConstraint":
         if not other:
             return self
@@ -144,7 +271,7 @@ class ValueConstraint:
             return ValueConstraint(msg.op, msg.value, name=msg.name, verbose=msg.verbose)
 
     def to_protobuf(self) -> ValueConstraintMsg:
-        if hasattr(self, "value"):
+        if self.value is not None:
             if isinstance(self.value, set):
                 set_vals_message = ListValue()
                 set_vals_message.append(list(self.value))
@@ -211,6 +338,8 @@ class SummaryConstraint:
 
     """
 
+    __slots__ = ("_name", "_verbose", "_cached_name", "op", "first_field", "second_field", "third_field", "total", "failures", "value", "upper_value", "func")
+
     def __init__(
         self,
         first_field: str,
@@ -267,20 +396,25 @@ class SummaryConstraint:
             else:
                 raise ValueError("Summary constraint must specify a second value or field name, but not both")
 
+        # format the report name once; it is immutable after construction
+        if name is not None:
+            self._cached_name = name
+        elif op == Op.BTWN:
+            lower_target = value if value is not None else second_field
+            upper_target = upper_value if upper_value is not None else third_field
+            self._cached_name = f"summary {first_field} {Op.Name(op)} {lower_target} and {upper_target}"
+        else:
+            self._cached_name = f"summary {first_field} {Op.Name(op)} {value}/{second_field}"
+
     @property
     def name(self):
-        if self.op == Op.BTWN:
-            lower_target = self.value if self.value is not None else self.second_field
-            upper_target = self.upper_value if self.upper_value is not None else self.third_field
-            return self._name if self._name is not None else f"summary {self.first_field} {Op.Name(self.op)} {lower_target} and {upper_target}"
-
-        return self._name if self._name is not None else f"summary {self.first_field} {Op.Name(self.op)} {self.value}/{self.second_field}"
+        return self._cached_name
 
     def update(self, summ: NumberSummary) -> bool:
         self.total += 1
         if not self.func(summ):
             self.failures += 1
-            if self._verbose:
+            if self._verbose and logger.isEnabledFor(logging.INFO):
                 logger.info(f"summary constraint {self.name} failed")
 
     def merge(self, other) -> "SummaryConstraint":
@@ -423,7 +557,7 @@ class ValueConstraints:
         return None
 
     def __getitem__(self, name: str) -> Optional[ValueConstraint]:
-        if self.contraints:
+        if self.constraints:
             return self.constraints.get(name)
         return None
 
@@ -439,13 +573,20 @@ class ValueConstraints:
         for c in self.constraints.values():
             c.update(v)
 
+    def update_batch(self, values):
+        # convert once so each constraint sees the same array
+        arr = np.asarray(values)
+        for c in self.constraints.values():
+            c.update_batch(arr)
+
     def merge(self, other) -> "ValueConstraints":
         if not other or not other.constraints:
             return self
 
         merged_constraints = other.constraints.copy()
-        for name, constraint in self.constraints:
-            merged_constraints[name] = constraint.merge(other.constraints.get(name))
+        for name, constraint in self.constraints.items():
+            # read back from the copy to avoid a second lookup in other
+            merged_constraints[name] = constraint.merge(merged_constraints.get(name))
 
         return ValueConstraints(merged_constraints)
 
@@ -475,7 +616,7 @@ class SummaryConstraints:
         return None
 
     def __getitem__(self, name: str) -> Optional[SummaryConstraint]:
-        if self.contraints:
+        if self.constraints:
             return self.constraints.get(name)
         return None
 
@@ -497,8 +638,8 @@ class SummaryConstraints:
             return self
 
         merged_constraints = other.constraints.copy()
-        for name, constraint in self.constraints:
-            merged_constraints[name] = constraint.merge(other.constraints.get(name))
+        for name, constraint in self.constraints.items():
+            merged_constraints[name] = constraint.merge(merged_constraints.get(name))
 
         return SummaryConstraints(merged_constraints)
 
@@ -1,6 +1,7 @@
 import datetime
 import os
 import shutil
+import time
 from datetime import timezone
 
 import pytest
@@ -26,7 +27,8 @@ def test_no_log_rotation(tmpdir):
 def test_log_rotation_parsing():
     with freeze_time("2012-01-14 03:21:34", tz_offset=-4) as frozen_time:
         l = Logger(session_id="", dataset_name="testing")
-        now = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+        # rotation bookkeeping is based on time.time()
+        now = int(time.time())
         l._set_rotation(with_rotation_time="s")
         assert l.interval == 1
         assert l.rotate_at == now + 1
@@ -86,6 +88,31 @@ def test_log_rotation_seconds(tmpdir, df):
     shutil.rmtree(output_path, ignore_errors=True)
 
 
+def test_log_rotation_batched_writes(tmpdir, df):
+    output_path = tmpdir.mkdir("whylogs")
+    shutil.rmtree(output_path, ignore_errors=True)
+    writer_config = WriterConfig("local", ["protobuf"], output_path.realpath())
+    yaml_data = writer_config.to_yaml()
+    WriterConfig.from_yaml(yaml_data)
+
+    session_config = SessionConfig("project", "pipeline", writers=[writer_config])
+    with freeze_time("2012-01-14 03:21:34", tz_offset=-4) as frozen_time:
+        with session_from_config(session_config) as session:
+            # cache_size > 1 batches rotated profiles before handing them to writers
+            with session.logger("test", with_rotation_time="s", cache_size=2) as logger:
+                logger.log_dataframe(df)
+                frozen_time.tick(delta=datetime.timedelta(seconds=1))
+                logger.log_dataframe(df)
+                frozen_time.tick(delta=datetime.timedelta(seconds=1))
+                logger.log_dataframe(df)
+                logger.close()
+    output_files = []
+    for _, _, files in os.walk(output_path):
+        output_files += files
+    assert len(output_files) == 3
+    shutil.rmtree(output_path, ignore_errors=True)
+
+
 def test_log_rotation_minutes(tmpdir, df):
     output_path = tmpdir.mkdir("whylogs")
     shutil.rmtree(output_path, ignore_errors=True)
@@ -0,0 +1,43 @@
+import datetime
+from datetime import timezone
+
+from whylogs.app.logger import Logger
+
+
+def test_log_batch(tmpdir):
+    with Logger(session_id="", dataset_name="testing", dataset_timestamp=datetime.datetime.now(tz=timezone.utc)) as logger:
+        logger.log_batch(
+            [
+                {"col_a": 1, "col_b": "x"},
+                {"col_a": 2, "col_b": "y"},
+                {"col_a": 3, "col_b": "z"},
+            ]
+        )
+        profile = logger.profile
+        assert profile.columns["col_a"].counters.count == 3
+        assert profile.columns["col_b"].counters.count == 3
+
+
+def test_log_features_and_datum(tmpdir):
+    with Logger(session_id="", dataset_name="testing", dataset_timestamp=datetime.datetime.now(tz=timezone.utc)) as logger:
+        logger.log_features({"col_a": 1, "col_b": "x"})
+        logger.log_datum("col_a", 2)
+        profile = logger.profile
+        assert profile.columns["col_a"].counters.count == 2
+        assert profile.columns["col_b"].counters.count == 1
+
+
+def test_log_csv_chunked(tmpdir, df):
+    csv_path = str(tmpdir.join("data.csv"))
+    df.to_csv(csv_path, index=False)
+    with Logger(session_id="", dataset_name="testing", dataset_timestamp=datetime.datetime.now(tz=timezone.utc)) as logger:
+        logger.log_csv(csv_path, chunksize=7)
+        profile = logger.profile
+        for col in df.columns:
+            assert profile.columns[col].counters.count == len(df)
+
+
+def test_log_batch_empty(tmpdir):
+    with Logger(session_id="", dataset_name="testing", dataset_timestamp=datetime.datetime.now(tz=timezone.utc)) as logger:
+        logger.log_batch([])
+        assert logger.profile.columns == {}
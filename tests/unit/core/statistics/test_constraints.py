@@ -9,7 +9,9 @@ from whylogs.core.statistics.constraints import (
     DatasetConstraints,
     Op,
     SummaryConstraint,
+    SummaryConstraints,
     ValueConstraint,
+    ValueConstraints,
     _summary_funcs1,
     _value_funcs,
     columnValuesInSetConstraint,
@@ -122,6 +124,66 @@ def test_value_constraints_pattern_match(df_lending_club, local_config_path):
     assert report[2][1][0][2] == 50
 
 
+def test_value_constraints_update_batch():
+    import numpy as np
+
+    conforming_loan = ValueConstraint(Op.LT, 10)
+    contains_state = ValueConstraint(Op.MATCH, regex_pattern=r"^[a-zA-Z]{2}$")
+    vc = ValueConstraints([conforming_loan, contains_state])
+
+    vc.update_batch(np.array([1, 5, 20]))
+
+    # the numeric constraint is evaluated vectorized, the regex one per value
+    assert conforming_loan.total == 3
+    assert conforming_loan.failures == 1
+    assert contains_state.total == 3
+    assert contains_state.failures == 3
+
+
+def test_in_set_constraint_update_batch():
+    import numpy as np
+
+    in_set = columnValuesInSetConstraint({1, 2, 3})
+    in_set.update_batch(np.array([1, 5, 3]))
+
+    assert in_set.total == 3
+    assert in_set.failures == 1
+
+
+def test_value_constraint_name_with_falsy_value():
+    # value=0 must not be mistaken for a missing value / regex constraint
+    assert ValueConstraint(Op.EQ, 0).name == "value EQ 0"
+    assert ValueConstraint(Op.EQ, 0.0).name == "value EQ 0.0"
+    assert ValueConstraint(Op.EQ, 0, name="zero").name == "zero"
+
+
+def test_value_constraints_container_merge():
+    conforming_loan = ValueConstraint(Op.LT, 548250)
+    other_conforming_loan = ValueConstraint(Op.LT, 548250)
+    conforming_loan.update(100)
+    conforming_loan.update(600000)
+    other_conforming_loan.update(200)
+
+    merged = ValueConstraints([conforming_loan]).merge(ValueConstraints([other_conforming_loan]))
+    merged_constraint = merged[conforming_loan.name]
+
+    assert merged_constraint is not None
+    assert merged_constraint.total == 3
+    assert merged_constraint.failures == 1
+
+
+def test_summary_constraints_container_merge():
+    non_negative = SummaryConstraint("min", Op.GE, 0)
+    other_non_negative = SummaryConstraint("min", Op.GE, 0)
+
+    merged = SummaryConstraints([non_negative]).merge(SummaryConstraints([other_non_negative]))
+    merged_constraint = merged[non_negative.name]
+
+    assert merged_constraint is not None
+    assert merged_constraint.total == 0
+    assert merged_constraint.failures == 0
+
+
 def test_summary_constraints(df_lending_club, local_config_path):
     non_negative = SummaryConstraint("min", Op.GE, 0)
 